@@ -1,25 +1,32 @@
 # Import required libraries
-import json
+import asyncio
+import base64
 import os
-import requests
+import orjson
+import httpx
 from datetime import datetime, timedelta
-import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 import uvicorn
-from functools import wraps
+from functools import lru_cache, wraps
 import time
 import hashlib
+import logging
+import heapq
+from collections import OrderedDict, defaultdict
 
 # Initialize FastAPI application
+# ORJSONResponse serializes responses with orjson (including numpy arrays) instead of stdlib json
 app = FastAPI(
     title="Form D Analytics Hub",
     description="SEC Form D filing analytics powered by The Marketcast backend",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Define allowed origins for CORS (Cross-Origin Resource Sharing)
@@ -38,12 +45,77 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Compress JSON responses (chart figures and workspace configs) for clients that accept gzip
+# Bodies under 1 KB are sent as-is since compression wouldn't pay for itself
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Backend configuration
 BACKEND_URL = os.getenv("FORM_D_BACKEND_URL", "https://web-production-570e.up.railway.app")
 
-# Simple in-memory cache
-cache_store = {}
+# Request tracing is logged at DEBUG so it costs nothing in production; set FORM_D_LOG_LEVEL=DEBUG to see it
+LOG_LEVEL = os.getenv("FORM_D_LOG_LEVEL", "INFO").upper()
+logger = logging.getLogger("formd")
+# uvicorn only configures its own loggers, so formd gets its own handler instead of the root logger's
+if not logger.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(log_handler)
+    logger.propagate = False
+# An unknown level name falls back to INFO rather than failing the import
+if isinstance(logging.getLevelName(LOG_LEVEL), int):
+    logger.setLevel(LOG_LEVEL)
+else:
+    logger.setLevel(logging.INFO)
+    logger.warning("Unknown FORM_D_LOG_LEVEL %r, using INFO", LOG_LEVEL)
+
+# Shared async HTTP client so backend calls don't block the event loop.
+# Created on startup and reused for every request so connections (and TLS sessions) stay pooled.
+http_client = None
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(30, connect=5)  # Fail fast when the backend is unreachable
+HTTP_CONNECT_RETRIES = 2  # Retry failed connection attempts (not failed responses)
+
+@app.on_event("startup")
+async def open_http_client():
+    """Open the pooled backend HTTP client (HTTP/2 when the backend negotiates it)"""
+    global http_client
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_CONNECT_RETRIES)
+    http_client = httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Stop the background cache warmer and close pooled backend connections"""
+    if prewarm_task is not None:
+        prewarm_task.cancel()
+    await http_client.aclose()
+
+# Numeric trace arrays at least this long are sent as base64 typed arrays.
+# Off by default: the rendering Plotly.js must be 2.28 or newer to decode them,
+# otherwise those traces silently render empty. Set FORM_D_TYPED_ARRAYS=1 to enable.
+TYPED_ARRAYS_ENABLED = os.getenv("FORM_D_TYPED_ARRAYS", "0") == "1"
+TYPED_ARRAY_KEYS = ("x", "y", "z", "values")
+TYPED_ARRAY_MIN_LENGTH = 32
+
+# Simple in-memory LRU cache of pre-serialized JSON responses
+cache_store = OrderedDict()
 CACHE_DURATION = 5 * 60  # 5 minutes in seconds
+CACHE_MAX_ITEMS = 1024  # Oldest entries are evicted beyond this size
+
+# Backend responses change at most daily, so parsed payloads are reused for 10 minutes
+backend_cache = OrderedDict()
+backend_requests_in_flight = {}  # endpoint -> pending fetch shared by concurrent callers
+BACKEND_CACHE_DURATION = 10 * 60  # 10 minutes in seconds
+BACKEND_CACHE_MAX_ITEMS = 512
+# Per-path overrides: the latest filings list changes as new filings come in,
+# while the intro page's headline totals only move by a few filings a day
+BACKEND_CACHE_DURATIONS = {
+    "filings": 60,
+    "stats": 60 * 60,
+}
+
+# Default dashboard endpoints are refetched in the background a minute before they expire
+prewarm_task = None
+PREWARM_INTERVAL = BACKEND_CACHE_DURATION - 60
 
 def create_cache_key(func_name: str, **kwargs) -> str:
     """Create a unique cache key from function name and parameters"""
@@ -54,29 +126,54 @@ def create_cache_key(func_name: str, **kwargs) -> str:
     key_string = "|".join(key_parts)
     return hashlib.md5(key_string.encode()).hexdigest()
 
+def encode_json(data) -> bytes:
+    """Serialize a handler result to JSON bytes with orjson (numpy arrays included)"""
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def json_response(content) -> Response:
+    """Wrap already-encoded JSON bytes in a response, skipping FastAPI's encoder"""
+    return Response(content=content, media_type="application/json")
+
+def encoded_response(func):
+    """Decorator to return handler results as pre-encoded JSON bytes
+
+    FastAPI otherwise walks every returned dict with jsonable_encoder before
+    serializing it; the handlers only produce plain JSON types, so that walk is skipped.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return json_response(encode_json(await func(*args, **kwargs)))
+
+    return wrapper
+
 def cache_response(func):
-    """Decorator to cache function responses for 5 minutes"""
+    """Decorator to cache serialized function responses for 5 minutes"""
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    async def wrapper(*args, **kwargs):
         # Create cache key from function name and arguments
-        cache_key = create_cache_key(func.__name__, **kwargs)
-        
+        # nocache=True skips the lookup and refreshes the entry shared with regular requests
+        nocache = kwargs.get("nocache", False)
+        cache_key = create_cache_key(func.__name__, **{k: v for k, v in kwargs.items() if k != "nocache"})
+
         # Check if we have a cached response
-        if cache_key in cache_store:
+        if not nocache and cache_key in cache_store:
             cached_data, timestamp = cache_store[cache_key]
             if time.time() - timestamp < CACHE_DURATION:
-                print(f"📦 Cache hit for {func.__name__}")
-                return cached_data
+                logger.debug("📦 Cache hit for %s", func.__name__)
+                cache_store.move_to_end(cache_key)
+                return json_response(cached_data)
             else:
                 # Cache expired, remove it
                 del cache_store[cache_key]
-        
-        # Execute function and cache result
-        print(f"🔄 Cache miss for {func.__name__} - fetching fresh data")
-        result = func(*args, **kwargs)
+
+        # Execute function and cache the encoded result so hits skip serialization
+        logger.debug("🔄 Cache miss for %s - fetching fresh data", func.__name__)
+        result = encode_json(await func(*args, **kwargs))
         cache_store[cache_key] = (result, time.time())
-        return result
-    
+        if len(cache_store) > CACHE_MAX_ITEMS:
+            cache_store.popitem(last=False)
+        return json_response(result)
+
     return wrapper
 
 def get_theme_colors(theme: str = "dark"):
@@ -108,8 +205,12 @@ def get_toolbar_config():
         'scrollZoom': False
     }
 
+@lru_cache(maxsize=4096)
 def format_currency_short(value: float) -> str:
-    """Format currency values as short form ($1.2M, $3.4B, $1.0T)"""
+    """Format currency values as short form ($1.2M, $3.4B, $1.0T)
+
+    Memoized because chart series repeat values heavily (e.g. runs of zeros).
+    """
     absolute_value = abs(float(value))
     if absolute_value >= 1_000_000_000_000:
         return f"${value / 1_000_000_000_000:.1f}T"
@@ -134,9 +235,26 @@ def get_hover_colors(theme: str = "dark"):
             'bordercolor': '#374151'
         }
 
+AMOUNT_METRICS = frozenset({"offering_amount", "amount_sold"})
+
 def is_amount_metric(metric: str) -> bool:
     """Check if metric is an amount-based metric"""
-    return metric in ["offering_amount", "amount_sold"]
+    return metric in AMOUNT_METRICS
+
+def get_security_type_keys(metric: str) -> tuple:
+    """Get the (equity, debt, fund) time series field names for a metric"""
+    if is_amount_metric(metric):
+        return ("equity_amount", "debt_amount", "fund_amount")
+    return ("equity_filings", "debt_filings", "fund_filings")
+
+def get_timeseries_endpoint(metric: str, industry: str = None) -> str:
+    """Get the backend monthly time series endpoint for a metric and optional industry"""
+    if industry and industry != "all":
+        # Industry-specific series only carry totals, not a security type breakdown
+        return f"charts/industry-timeseries?metric={metric}&industry={industry}"
+    if is_amount_metric(metric):
+        return f"charts/amount-raised-timeseries?metric={metric}"
+    return "charts"
 
 def build_query_params(year: str = None, metric: str = None, industry: str = None, **kwargs) -> str:
     """Build query parameters string for API endpoints"""
@@ -155,8 +273,12 @@ def build_query_params(year: str = None, metric: str = None, industry: str = Non
     
     return "&".join(params)
 
+@lru_cache(maxsize=1024)
 def build_filter_context(year: str = None, metric: str = None, industry: str = None) -> str:
-    """Build filter context string for chart titles"""
+    """Build filter context string for chart titles
+
+    Memoized because the same few year/metric/industry filters are requested over and over.
+    """
     filter_parts = []
     if year and year != "all":
         filter_parts.append(f"Year: {year}")
@@ -178,8 +300,8 @@ def get_hover_template(metric: str, chart_type: str = "bar") -> str:
             return '<b>%{label}</b><br>Amount: %{customdata}<br>Percentage: %{percent}<extra></extra>'
         elif chart_type == "scatter":
             return '<b>%{x}</b><br><b>%{fullData.name}</b>: %{customdata}<extra></extra>'
-        else:  # bar chart
-            return '<b>%{y}</b><br>Amount: %{customdata}<extra></extra>'
+        else:  # bar chart, where the formatted amounts are already the bar text
+            return '<b>%{y}</b><br>Amount: %{text}<extra></extra>'
     else:
         if chart_type == "pie":
             return '<b>%{label}</b><br>Filings: %{value:,}<br>Percentage: %{percent}<extra></extra>'
@@ -195,6 +317,10 @@ def format_text_values(values: list, metric: str) -> list:
     else:
         return [f'{val:,.0f}' for val in values]
 
+def truncate_label(text: str, max_length: int) -> str:
+    """Truncate a label to max_length characters, adding an ellipsis when cut"""
+    return text if len(text) <= max_length else text[:max_length] + "..."
+
 def get_y_axis_title(metric: str) -> str:
     """Get Y-axis title based on metric type"""
     return "Amount ($)" if is_amount_metric(metric) else "Number of Filings"
@@ -207,44 +333,81 @@ def build_chart_title(title: str, subtitle: str, theme_colors: dict) -> dict:
         'font': {'size': 16, 'color': theme_colors["text"]}
     }
 
+SECURITY_TYPE_COLORS = {
+    'Equity': '#3B82F6',
+    'Debt': '#F59E0B',
+    'Fund': '#10B981'
+}
+
 def get_security_type_color(security_type: str) -> str:
     """Get color for security type"""
-    color_map = {
-        'Equity': '#3B82F6',
-        'Debt': '#F59E0B', 
-        'Fund': '#10B981'
-    }
-    return color_map.get(security_type, '#8B5CF6')
+    return SECURITY_TYPE_COLORS.get(security_type, '#8B5CF6')
 
 def aggregate_company_data(data: list, key_field: str = "company_name", value_field: str = "amount") -> list:
     """Aggregate data by company, keeping only the largest value per company"""
     aggregated = {}
     for item in data:
         key = item.get(key_field, "Unknown")
-        value = item.get(value_field, 0)
-        
-        if key in aggregated:
-            # Keep only the largest amount for the same company
-            if value > aggregated[key][value_field]:
-                aggregated[key] = item
-        else:
+        current = aggregated.get(key)
+        # Keep only the largest amount for the same company
+        if current is None or item.get(value_field, 0) > current[value_field]:
             aggregated[key] = item
     
     return list(aggregated.values())
 
 def sort_and_limit_data(data: list, sort_key: str, limit: int = None, reverse: bool = True) -> list:
     """Sort data by key and optionally limit results"""
-    sorted_data = sorted(data, key=lambda x: x.get(sort_key, 0), reverse=reverse)
-    return sorted_data[:limit] if limit else sorted_data
+    sort_value = lambda x: x.get(sort_key, 0)
+    if limit:
+        # Partial selection is O(n log limit) instead of a full sort
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(limit, data, key=sort_value)
+    return sorted(data, key=sort_value, reverse=reverse)
 
 def get_total_value(data: list, value_field: str = "value") -> float:
     """Calculate total value from a list of dictionaries"""
     return sum(item.get(value_field, 0) for item in data)
 
-def figure_to_json(fig) -> dict:
-    """Convert Plotly figure to JSON with toolbar config"""
-    figure_json = json.loads(fig.to_json())
-    figure_json['config'] = get_toolbar_config()
+def to_typed_array(values: list):
+    """Encode a numeric list as a Plotly.js base64 typed array, or return None if not numeric
+
+    Typed arrays ({"dtype": ..., "bdata": ...}) are smaller on the wire than JSON
+    number lists and are decoded by the browser without parsing every number.
+    """
+    if not all(type(value) in (int, float) for value in values):
+        return None
+    array = np.asarray(values)
+    if array.dtype.kind == "i" and np.abs(array).max() < 2**31:
+        array, dtype = array.astype("<i4"), "i4"
+    else:
+        array, dtype = array.astype("<f8"), "f8"
+    return {"dtype": dtype, "bdata": base64.b64encode(array.tobytes()).decode("ascii")}
+
+def encode_typed_arrays(figure_json: dict) -> dict:
+    """Replace long numeric trace arrays with base64 typed arrays"""
+    for trace in figure_json.get("data", []):
+        for key in TYPED_ARRAY_KEYS:
+            values = trace.get(key)
+            if isinstance(values, (list, tuple)) and len(values) >= TYPED_ARRAY_MIN_LENGTH:
+                typed_array = to_typed_array(values)
+                if typed_array is not None:
+                    trace[key] = typed_array
+    return figure_json
+
+# Plotly's default template, which go.Figure embeds in every figure's layout
+PLOTLY_TEMPLATE = go.Figure().to_plotly_json()["layout"]["template"]
+
+def build_figure(traces: list, layout: dict) -> dict:
+    """Assemble a JSON-ready Plotly figure dict with the default template and toolbar config
+
+    Traces and layout are plain dicts in Plotly's JSON schema, so the graph_objects
+    validation and deep copies are skipped. As with graph_objects, None properties are left unset.
+    """
+    data = [{key: value for key, value in trace.items() if value is not None} for trace in traces]
+    figure_json = {"data": data, "layout": {**layout, "template": PLOTLY_TEMPLATE}}
+    if TYPED_ARRAYS_ENABLED:
+        encode_typed_arrays(figure_json)
+    figure_json['config'] = TOOLBAR_CONFIG
     return figure_json
 
 def base_layout(theme: str = "dark"):
@@ -272,20 +435,110 @@ def base_layout(theme: str = "dark"):
         }
     }
 
-def fetch_backend_data(endpoint):
-    """Fetch data from Form D backend with error handling"""
+def resolve_theme(theme: str) -> str:
+    """Map a requested theme onto a supported one (anything but light renders dark)"""
+    return "light" if theme == "light" else "dark"
+
+# Theme-dependent chart settings are identical for every request, so build them once.
+# Treat these as read-only; copy before mutating (e.g. {**BASE_LAYOUTS[theme], ...}).
+THEMES = ("dark", "light")
+THEME_COLORS = {theme: get_theme_colors(theme) for theme in THEMES}
+HOVER_COLORS = {theme: get_hover_colors(theme) for theme in THEMES}
+BASE_LAYOUTS = {theme: base_layout(theme) for theme in THEMES}
+AXIS_STYLES = {
+    theme: {
+        'title': {'font': {'color': THEME_COLORS[theme]["text"]}},
+        'tickfont': {'color': THEME_COLORS[theme]["text"]},
+        'gridcolor': THEME_COLORS[theme]["grid"]
+    }
+    for theme in THEMES
+}
+TOOLBAR_CONFIG = get_toolbar_config()
+
+def get_axis_layout(theme: str, title: str = None, **settings) -> dict:
+    """Get a themed axis layout with an optional title text and extra settings (e.g. range)"""
+    axis = {**AXIS_STYLES[resolve_theme(theme)], **settings}
+    if title is not None:
+        # Titled axes inherit the title font color from the layout font
+        axis['title'] = {'text': title}
+    return axis
+
+def get_backend_cache_duration(endpoint: str) -> int:
+    """Get how long a backend response is reused, based on the endpoint path"""
+    path = endpoint.split("?", 1)[0]
+    return BACKEND_CACHE_DURATIONS.get(path, BACKEND_CACHE_DURATION)
+
+async def fetch_backend_data(endpoint, use_cache: bool = True):
+    """Fetch data from Form D backend with error handling
+
+    Successful responses are cached per endpoint (see get_backend_cache_duration).
+    Cached data is shared between requests, so callers must not mutate it.
+    Pass use_cache=False to force a fresh fetch (the cached entry is refreshed).
+    """
+    # Serve from the backend cache while the entry is fresh
+    if use_cache and endpoint in backend_cache:
+        cached_data, timestamp = backend_cache[endpoint]
+        if time.time() - timestamp < get_backend_cache_duration(endpoint):
+            backend_cache.move_to_end(endpoint)
+            return cached_data
+        del backend_cache[endpoint]
+    
+    # Widgets on one dashboard load concurrently and often need the same endpoint
+    # (e.g. monthly activity and yearly statistics), so concurrent callers share one request
+    pending = backend_requests_in_flight.get(endpoint)
+    if pending is None:
+        pending = asyncio.ensure_future(request_backend_data(endpoint))
+        backend_requests_in_flight[endpoint] = pending
+        pending.add_done_callback(lambda _: backend_requests_in_flight.pop(endpoint, None))
+    # Shield so one disconnecting client doesn't cancel the request for the others
+    return await asyncio.shield(pending)
+
+async def request_backend_data(endpoint):
+    """Request an endpoint from the Form D backend and cache the parsed response"""
     try:
         url = f"{BACKEND_URL}/api/{endpoint}"
-        print(f"📡 Fetching: {url}")
-        response = requests.get(url, timeout=30)
+        logger.debug("📡 Fetching: %s", url)
+        # Awaiting the request frees the event loop to serve other requests meanwhile
+        response = await http_client.get(url)
         response.raise_for_status()
-        data = response.json()
-        print(f"✅ Success: {endpoint}")
+        data = orjson.loads(response.content)
+        logger.debug("✅ Success: %s", endpoint)
+        backend_cache[endpoint] = (data, time.time())
+        backend_cache.move_to_end(endpoint)
+        if len(backend_cache) > BACKEND_CACHE_MAX_ITEMS:
+            backend_cache.popitem(last=False)
         return data
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error fetching {endpoint}: {e}")
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error("❌ Error fetching %s: %s", endpoint, e)
         return None
 
+def get_prewarm_endpoints() -> list:
+    """Backend endpoints behind the default dashboard load, kept warm in the backend cache"""
+    # The year dropdown (and the security type chart) is requested by every page load
+    endpoints = ["charts/security-type-distribution?metric=count"]
+    for year in ("all", str(datetime.now().year)):
+        for metric in ("count", "offering_amount", "amount_sold"):
+            query_string = build_query_params(year=year, metric=metric)
+            endpoints.append(f"charts/location-distribution?{query_string}")
+    # count and offering_amount are both backend defaults and map to the same endpoint
+    return list(dict.fromkeys(endpoints))
+
+async def prewarm_backend_cache():
+    """Refresh the most requested backend endpoints shortly before their cache entries expire"""
+    while True:
+        # Fetch concurrently; return_exceptions keeps one failure from stopping the loop
+        await asyncio.gather(
+            *(fetch_backend_data(endpoint, use_cache=False) for endpoint in get_prewarm_endpoints()),
+            return_exceptions=True
+        )
+        await asyncio.sleep(PREWARM_INTERVAL)
+
+@app.on_event("startup")
+async def start_prewarm():
+    """Start warming the backend cache in the background so startup isn't delayed"""
+    global prewarm_task
+    prewarm_task = asyncio.create_task(prewarm_backend_cache())
+
 @app.get("/")
 def read_root():
     """Root endpoint"""
@@ -297,30 +550,40 @@ def read_root():
         "description": "Private placement fundraising analytics from SEC Form D filings"
     }
 
+def read_file_bytes(path: str) -> bytes:
+    """Read a file's raw contents"""
+    with open(path, "rb") as file:
+        return file.read()
+
+# Workspace configuration files are static, so they are read once and served from memory
+WIDGETS_JSON = read_file_bytes("widgets.json")
+APPS_JSON = read_file_bytes("apps.json")
+
 @app.get("/widgets.json")
-def get_widgets():
+async def get_widgets():
     """Widgets configuration file for the OpenBB Workspace
 
     Returns:
-        FileResponse: The contents of widgets.json file
+        Response: The contents of widgets.json file
     """
-    return FileResponse("widgets.json", media_type="application/json")
+    return json_response(WIDGETS_JSON)
 
 @app.get("/apps.json")
-def get_apps():
+async def get_apps():
     """Apps configuration file for the OpenBB Workspace
 
     Returns:
-        FileResponse: The contents of apps.json file
+        Response: The contents of apps.json file
     """
-    return FileResponse("apps.json", media_type="application/json")
+    return json_response(APPS_JSON)
 
 @app.get("/form_d_intro")
-def get_form_d_intro():
+@encoded_response
+async def get_form_d_intro():
     """Get Form D dashboard introduction markdown"""
     try:
         # Get some basic stats for dynamic content
-        stats = fetch_backend_data("stats")
+        stats = await fetch_backend_data("stats")
         
         total_filings = f"{stats.get('total_filings', 2450):,}" if stats else "2,450+"
         total_raised = stats.get("total_offering_amount", "$125B+") if stats else "$125B+"
@@ -337,17 +600,18 @@ Form D filings provide insights into private market activity including private s
         return markdown_content
         
     except Exception as e:
-        print(f"Error in form_d_intro: {e}")
+        logger.error("Error in form_d_intro: %s", e)
         return "# Form D Filings Dashboard\n\nError loading introduction content."
 
 @app.get("/latest_filings")
-def get_latest_filings(page: int = 1, per_page: int = 15):
+@encoded_response
+async def get_latest_filings(page: int = 1, per_page: int = 15):
     """Get latest Form D filings as table data with page navigation"""
     try:
-        print(f"📄 Page request: {page}")
+        logger.debug("📄 Page request: %s", page)
         
         # Fetch real data from backend with pagination
-        data = fetch_backend_data(f"filings?page={page}&per_page={per_page}")
+        data = await fetch_backend_data(f"filings?page={page}&per_page={per_page}")
         
         if not data or not data.get("data"):
             return []
@@ -367,11 +631,11 @@ def get_latest_filings(page: int = 1, per_page: int = 15):
             location = filing.get("display_location") or f"{filing.get('city', 'Unknown')}, {filing.get('state', 'Unknown')}"
             
             filings_data.append({
-                "company": company_name[:45] + "..." if len(company_name) > 45 else company_name,
+                "company": truncate_label(company_name, 45),
                 "amount": amount,
                 "type": filing.get("security_type") or "Unknown",
-                "industry": (filing.get("industry") or "Unknown")[:20] + "..." if len(filing.get("industry", "")) > 20 else (filing.get("industry") or "Unknown"), 
-                "location": location[:25] + "..." if len(location) > 25 else location,
+                "industry": truncate_label(filing.get("industry") or "Unknown", 20),
+                "location": truncate_label(location, 25),
                 "date": str(filing.get("filing_date")) if filing.get("filing_date") else "Unknown"
             })
         
@@ -379,15 +643,15 @@ def get_latest_filings(page: int = 1, per_page: int = 15):
         return filings_data
         
     except Exception as e:
-        print(f"Error in latest_filings: {e}")
+        logger.error("Error in latest_filings: %s", e)
         return [{"error": str(e)}]
 
 @app.get("/security_types")
 @cache_response
-def get_security_types(year: str = None, metric: str = "count", theme: str = "dark", raw: bool = False):
+async def get_security_types(year: str = None, metric: str = "count", theme: str = "dark", raw: bool = False, nocache: bool = False):
     """Get security type distribution chart with filtering options"""
     try:
-        print(f"🔍 Fetching security type distribution data... (year: {year}, metric: {metric})")
+        logger.debug("🔍 Fetching security type distribution data... (year: %s, metric: %s)", year, metric)
         
         # Build query parameters
         query_string = build_query_params(year=year, metric=metric)
@@ -395,7 +659,7 @@ def get_security_types(year: str = None, metric: str = "count", theme: str = "da
         if query_string:
             endpoint += f"&{query_string}"
         
-        data = fetch_backend_data(endpoint)
+        data = await fetch_backend_data(endpoint, use_cache=not nocache)
         
         if not data or not data.get("distribution"):
             return {"error": "No data available from backend"}
@@ -412,22 +676,22 @@ def get_security_types(year: str = None, metric: str = "count", theme: str = "da
         total_value = get_total_value(distribution)
         
         # Group data for chart display (Top 4 + Other)
-        display_data = sort_and_limit_data(distribution, "value", reverse=True)
-        top_4 = display_data[:4]
+        # Only the top 4 are selected; the rows not picked are summed directly, since
+        # subtracting from the float total leaves rounding residue (even negative values)
+        top_4 = sort_and_limit_data(distribution, "value", limit=4, reverse=True)
         
-        if len(display_data) > 4:
-            others = display_data[4:]
+        if len(distribution) > 4:
+            picked = {id(item) for item in top_4}
             other_item = {
                 "name": "All Others",
-                "value": get_total_value(others)
+                "value": get_total_value([item for item in distribution if id(item) not in picked])
             }
             top_4.append(other_item)
         
         final_data = top_4
         
         # Get theme colors
-        theme_colors = get_theme_colors(theme)
-        hover_colors = get_hover_colors(theme)
+        theme_colors = THEME_COLORS[resolve_theme(theme)]
         colors = ['#3B82F6', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6']
         
         # Add filtering context to title
@@ -446,21 +710,22 @@ def get_security_types(year: str = None, metric: str = "count", theme: str = "da
         hover_template = get_hover_template(metric, "pie")
         formatted_values = format_text_values(values, metric) if is_amount_metric(metric) else None
 
-        fig = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
-            hole=0.4,
-            marker_colors=colors[:len(final_data)],
-            textinfo='label+percent',
-            textposition='auto',
-            textfont=dict(color=theme_colors["text"], size=12),
-            hovertemplate=hover_template,
-            customdata=formatted_values
-        )])
+        traces = [{
+            'type': 'pie',
+            'labels': labels,
+            'values': values,
+            'hole': 0.4,
+            'marker': {'colors': colors[:len(final_data)]},
+            'textinfo': 'label+percent',
+            'textposition': 'auto',
+            'textfont': {'color': theme_colors["text"], 'size': 12},
+            'hovertemplate': hover_template,
+            'customdata': formatted_values
+        }]
         
         # Apply base layout configuration
-        layout_config = base_layout(theme=theme)
-        layout_config.update({
+        layout_config = {
+            **BASE_LAYOUTS[resolve_theme(theme)],
             'title': build_chart_title("Security Type Distribution", chart_title, theme_colors),
             'height': 400,
             'showlegend': True,
@@ -471,20 +736,18 @@ def get_security_types(year: str = None, metric: str = "count", theme: str = "da
                 'font': {'size': 12, 'color': theme_colors["text"]}
             },
             'dragmode': False
-        })
+        }
 
-        fig.update_layout(layout_config)
-        
-        # Convert figure to JSON and apply config
-        return figure_to_json(fig)
+        # Assemble the figure JSON and apply config
+        return build_figure(traces, layout_config)
         
     except Exception as e:
-        print(f"❌ Error in security_types: {e}")
+        logger.error("❌ Error in security_types: %s", e)
         return {"error": str(e)}
 
 @app.get("/top_industries")
 @cache_response
-def get_top_industries(year: str = None, metric: str = "count", theme: str = "dark", raw: bool = False):
+async def get_top_industries(year: str = None, metric: str = "count", theme: str = "dark", raw: bool = False, nocache: bool = False):
     """Get top 10 industries chart with filtering options"""
     try:
         # Build query parameters
@@ -493,7 +756,7 @@ def get_top_industries(year: str = None, metric: str = "count", theme: str = "da
         if query_string:
             endpoint += f"&{query_string}"
         
-        data = fetch_backend_data(endpoint)
+        data = await fetch_backend_data(endpoint, use_cache=not nocache)
         
         if not data or not data.get("distribution"):
             return {"error": "No data available from backend"}
@@ -507,94 +770,56 @@ def get_top_industries(year: str = None, metric: str = "count", theme: str = "da
         distribution = sort_and_limit_data(distribution, "value", reverse=False)
         
         # Get theme colors
-        theme_colors = get_theme_colors(theme)
+        theme_colors = THEME_COLORS[resolve_theme(theme)]
         
         # Prepare text and hover template based on metric type
         values = [item["value"] for item in distribution]
+        x_max = max(values) * 1.1
         text_values = format_text_values(values, metric)
         hover_template = get_hover_template(metric, "bar")
-        customdata = text_values if is_amount_metric(metric) else None
-        
-        fig = go.Figure(data=[go.Bar(
-            x=[item["value"] for item in distribution],
-            y=[item["name"][:30] + "..." if len(item["name"]) > 30 else item["name"] for item in distribution],
-            orientation='h',
-            marker_color=theme_colors["main_line"],
-            text=text_values,
-            textposition='outside',
-            textfont=dict(color=theme_colors["text"], size=12),
-            hovertemplate=hover_template,
-            customdata=customdata
-        )])
+        
+        traces = [{
+            'type': 'bar',
+            'x': values,
+            'y': [truncate_label(item["name"], 30) for item in distribution],
+            'orientation': 'h',
+            'marker': {'color': theme_colors["main_line"]},
+            'text': text_values,
+            'textposition': 'outside',
+            'textfont': {'color': theme_colors["text"], 'size': 12},
+            'hovertemplate': hover_template
+        }]
         
         # Add filtering context to title
         filter_text = build_filter_context(year=year, metric=metric)
         subtitle = f"Real Form D data - most active sectors{filter_text}"
         
         # Apply base layout configuration
-        layout_config = base_layout(theme=theme)
-        layout_config.update({
+        layout_config = {
+            **BASE_LAYOUTS[resolve_theme(theme)],
             'title': build_chart_title("Top 10 Industries", subtitle, theme_colors),
-            'xaxis_title': get_y_axis_title(metric),
             'height': 400,
             'margin': {'l': 150, 'r': 50, 't': 80, 'b': 50},
-            'xaxis': {
-                'range': [0, max([item["value"] for item in distribution]) * 1.1],
-                'title': {'font': {'color': theme_colors["text"]}},
-                'tickfont': {'color': theme_colors["text"]},
-                'gridcolor': theme_colors["grid"]
-            },
-            'yaxis': {
-                'title': {'font': {'color': theme_colors["text"]}},
-                'tickfont': {'color': theme_colors["text"]},
-                'gridcolor': theme_colors["grid"]
-            },
+            'xaxis': get_axis_layout(theme, get_y_axis_title(metric), range=[0, x_max]),
+            'yaxis': AXIS_STYLES[resolve_theme(theme)],
             'dragmode': False
-        })
+        }
 
-        fig.update_layout(layout_config)
-        
-        # Convert figure to JSON and apply config
-        return figure_to_json(fig)
+        # Assemble the figure JSON and apply config
+        return build_figure(traces, layout_config)
         
     except Exception as e:
-        print(f"Error in top_industries: {e}")
+        logger.error("Error in top_industries: %s", e)
         return {"error": str(e)}
 
 @app.get("/monthly_activity")
 @cache_response
-def get_monthly_activity(metric: str = "count", industry: str = "all", theme: str = "dark", raw: bool = False):
+async def get_monthly_activity(metric: str = "count", industry: str = "all", theme: str = "dark", raw: bool = False, nocache: bool = False):
     """Get monthly filing activity time series with metric and industry selection"""
     try:
-        # Build query parameters
-        params = []
-        if industry and industry != "all":
-            params.append(f"industry={industry}")
-        
-        # Use industry-timeseries endpoint for industry filtering
-        if industry and industry != "all":
-            # Use industry-specific timeseries endpoint
-            endpoint = "charts/industry-timeseries"
-            if metric:
-                endpoint += f"?metric={metric}"
-        else:
-            # Use different endpoint based on metric for all industries
-            if metric == "offering_amount":
-                endpoint = "charts/amount-raised-timeseries?metric=offering_amount"
-            elif metric == "amount_sold":
-                endpoint = "charts/amount-raised-timeseries?metric=amount_sold"
-            else:
-                endpoint = "charts"
-        
-        # Add filters if specified
-        if params:
-            query_string = "&".join(params)
-            if "?" in endpoint:
-                endpoint += f"&{query_string}"
-            else:
-                endpoint += f"?{query_string}"
-        
-        data = fetch_backend_data(endpoint)
+        # Shared with yearly statistics, so both charts read the same cached series
+        endpoint = get_timeseries_endpoint(metric, industry)
+        data = await fetch_backend_data(endpoint, use_cache=not nocache)
         
         # Get current month for filtering
         current_date = datetime.now()
@@ -607,98 +832,69 @@ def get_monthly_activity(metric: str = "count", industry: str = "all", theme: st
             if industry and industry != "all":
                 # Industry-specific timeseries response format
                 time_series = data.get("timeseries", [])
-                months = [item["date"] for item in time_series]
-                if metric in ["offering_amount", "amount_sold"]:
-                    # For industry data, we only have total amounts, not by security type
-                    total_data = [item.get("total_amount", 0) for item in time_series]
-                    equity_data = total_data  # Show total as equity for industry view
-                    debt_data = [0] * len(total_data)  # No debt data for industry view
-                    fund_data = [0] * len(total_data)  # No fund data for industry view
-                else:
-                    # For count metric, show filings count
-                    total_data = [item.get("filings", 0) for item in time_series]
-                    equity_data = total_data  # Show total as equity for industry view
-                    debt_data = [0] * len(total_data)  # No debt data for industry view
-                    fund_data = [0] * len(total_data)  # No fund data for industry view
+                # For industry data, we only have totals (amount or filings count), not by security type
+                total_key = "total_amount" if is_amount_metric(metric) else "filings"
+                months, total_data = [], []
+                for item in time_series:
+                    months.append(item["date"])
+                    total_data.append(item.get(total_key, 0))
+                equity_data = total_data  # Show total as equity for industry view
+                debt_data = [0] * len(total_data)  # No debt data for industry view
+                fund_data = [0] * len(total_data)  # No fund data for industry view
             else:
                 # Regular timeseries response format (all industries)
                 time_series = data.get("time_series", [])
-                months = [item["date"] for item in time_series]
-                if metric == "offering_amount":
-                    equity_data = [item.get("equity_amount", 0) for item in time_series]
-                    debt_data = [item.get("debt_amount", 0) for item in time_series]
-                    fund_data = [item.get("fund_amount", 0) for item in time_series]
-                elif metric == "amount_sold":
-                    equity_data = [item.get("equity_amount", 0) for item in time_series]
-                    debt_data = [item.get("debt_amount", 0) for item in time_series]
-                    fund_data = [item.get("fund_amount", 0) for item in time_series]
-                else:
-                    equity_data = [item.get("equity_filings", 0) for item in time_series]
-                    debt_data = [item.get("debt_filings", 0) for item in time_series]
-                    fund_data = [item.get("fund_filings", 0) for item in time_series]
+                equity_key, debt_key, fund_key = get_security_type_keys(metric)
+                
+                # Extract all four columns in a single pass over the series
+                months, equity_data, debt_data, fund_data = [], [], [], []
+                for item in time_series:
+                    months.append(item["date"])
+                    equity_data.append(item.get(equity_key, 0))
+                    debt_data.append(item.get(debt_key, 0))
+                    fund_data.append(item.get(fund_key, 0))
             
             # Filter data: start from 2009 and exclude current month
-            filtered_indices = []
-            for i, month in enumerate(months):
-                # Check if year is 2009 or later
-                year = int(month[:4])
-                if year >= 2009 and month != current_month:
-                    filtered_indices.append(i)
-            
-            # Apply filtering to all data arrays
-            months = [months[i] for i in filtered_indices]
-            equity_data = [equity_data[i] for i in filtered_indices]
-            debt_data = [debt_data[i] for i in filtered_indices]
-            fund_data = [fund_data[i] for i in filtered_indices]
+            # Build a single boolean mask instead of looping over every month
+            months_arr = np.array(months, dtype=str)
+            years_arr = months_arr.astype("U4").astype(np.int16)  # YYYY-MM -> YYYY
+            mask = (years_arr >= 2009) & (months_arr != current_month)
+
+            # Apply filtering to all data arrays (the arrays are kept for the y-axis range)
+            months = months_arr[mask].tolist()
+            series_arrays = [np.asarray(series)[mask] for series in (equity_data, debt_data, fund_data)]
+            equity_data, debt_data, fund_data = (series.tolist() for series in series_arrays)
         
         # OPTIONAL - If raw is True, return the data as a list of dictionaries
+        # All series share the same mask, so they are always the same length as months
         if raw:
-            raw_data = []
-            for i, month in enumerate(months):
-                raw_data.append({
-                    "month": month,
-                    "equity": equity_data[i] if i < len(equity_data) else 0,
-                    "debt": debt_data[i] if i < len(debt_data) else 0,
-                    "fund": fund_data[i] if i < len(fund_data) else 0
-                })
-            return raw_data
+            return [
+                {"month": month, "equity": equity, "debt": debt, "fund": fund}
+                for month, equity, debt, fund in zip(months, equity_data, debt_data, fund_data)
+            ]
         
         # Get theme colors
-        theme_colors = get_theme_colors(theme)
-        hover_colors = get_hover_colors(theme)
+        theme_colors = THEME_COLORS[resolve_theme(theme)]
+        hover_colors = HOVER_COLORS[resolve_theme(theme)]
         
-        fig = go.Figure()
+        # Y-axis title and hover text depend only on the metric
+        y_title = get_y_axis_title(metric)
+        hover_tmpl = get_hover_template(metric, "scatter")
         
-        # Update trace names and y-axis based on metric and industry filter
+        # Update trace names based on metric and industry filter
         if industry and industry != "all":
-            # Industry-specific view - show only one line
-            if is_amount_metric(metric):
-                equity_name = f'{industry} - Total Amount'
-                debt_name = None  # Don't show debt line for industry view
-                fund_name = None  # Don't show fund line for industry view
-                y_title = "Amount ($)"
-                hover_tmpl = '<b>%{x}</b><br><b>%{fullData.name}</b>: %{customdata}<extra></extra>'
-            else:
-                equity_name = f'{industry} - Filings'
-                debt_name = None  # Don't show debt line for industry view
-                fund_name = None  # Don't show fund line for industry view
-                y_title = "Number of Filings"
-                hover_tmpl = '<b>%{x}</b><br><b>%{fullData.name}</b>: %{y:,.0f} filings<extra></extra>'
-        else:
+            # Industry-specific view - show only one line (no debt or fund lines)
+            equity_name = f'{industry} - Total Amount' if is_amount_metric(metric) else f'{industry} - Filings'
+            debt_name = fund_name = None
+        elif is_amount_metric(metric):
             # All industries view - show by security type
-            if is_amount_metric(metric):
-                equity_name = 'Equity'
-                debt_name = 'Debt'  
-                fund_name = 'Fund'
-                y_title = "Amount ($)"
-                hover_tmpl = '<b>%{x}</b><br><b>%{fullData.name}</b>: %{customdata}<extra></extra>'
-            else:
-                equity_name = 'Equity Filings'
-                debt_name = 'Debt Filings'
-                fund_name = 'Fund Filings' 
-                y_title = "Number of Filings"
-                hover_tmpl = '<b>%{x}</b><br><b>%{fullData.name}</b>: %{y:,.0f} filings<extra></extra>'
+            equity_name, debt_name, fund_name = 'Equity', 'Debt', 'Fund'
+        else:
+            equity_name, debt_name, fund_name = 'Equity Filings', 'Debt Filings', 'Fund Filings'
         
+        # Y-axis upper bound from the filtered arrays, without converting the lists back
+        y_max = float(max(series.max() for series in series_arrays)) * 1.1
+
         # Prepare custom data for currency formatting in tooltips
         if is_amount_metric(metric):
             equity_customdata = format_text_values(equity_data, metric)
@@ -709,41 +905,28 @@ def get_monthly_activity(metric: str = "count", industry: str = "all", theme: st
             debt_customdata = None
             fund_customdata = None
         
-        # Add traces based on whether we're filtering by industry
+        # Line traces as (series, name, color, custom data); all share the same styling
         if industry and industry != "all":
             # Industry-specific view - only show one line
-            fig.add_trace(go.Scatter(
-                x=months, y=equity_data, mode='lines+markers', name=equity_name,
-                line=dict(color='#3B82F6', width=3), marker=dict(size=6),
-                hovertemplate=hover_tmpl,
-                customdata=equity_customdata,
-                hoverlabel=dict(bgcolor=hover_colors['bgcolor'], bordercolor=hover_colors['bordercolor'], font=dict(color=theme_colors["text"]))
-            ))
+            series = [(equity_data, equity_name, '#3B82F6', equity_customdata)]
         else:
             # All industries view - show all security types
-            fig.add_trace(go.Scatter(
-                x=months, y=equity_data, mode='lines+markers', name=equity_name,
-                line=dict(color='#3B82F6', width=3), marker=dict(size=6),
-                hovertemplate=hover_tmpl,
-                customdata=equity_customdata,
-                hoverlabel=dict(bgcolor=hover_colors['bgcolor'], bordercolor=hover_colors['bordercolor'], font=dict(color=theme_colors["text"]))
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=months, y=debt_data, mode='lines+markers', name=debt_name,
-                line=dict(color='#F59E0B', width=3), marker=dict(size=6),
-                hovertemplate=hover_tmpl,
-                customdata=debt_customdata,
-                hoverlabel=dict(bgcolor=hover_colors['bgcolor'], bordercolor=hover_colors['bordercolor'], font=dict(color=theme_colors["text"]))
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=months, y=fund_data, mode='lines+markers', name=fund_name,
-                line=dict(color='#10B981', width=3), marker=dict(size=6),
-                hovertemplate=hover_tmpl,
-                customdata=fund_customdata,
-                hoverlabel=dict(bgcolor=hover_colors['bgcolor'], bordercolor=hover_colors['bordercolor'], font=dict(color=theme_colors["text"]))
-            ))
+            series = [
+                (equity_data, equity_name, '#3B82F6', equity_customdata),
+                (debt_data, debt_name, '#F59E0B', debt_customdata),
+                (fund_data, fund_name, '#10B981', fund_customdata)
+            ]
+        hoverlabel = {'bgcolor': hover_colors['bgcolor'], 'bordercolor': hover_colors['bordercolor'], 'font': {'color': theme_colors["text"]}}
+        traces = [
+            {
+                'type': 'scatter', 'x': months, 'y': series_data, 'mode': 'lines+markers', 'name': name,
+                'line': {'color': color, 'width': 3}, 'marker': {'size': 6},
+                'hovertemplate': hover_tmpl,
+                'customdata': customdata,
+                'hoverlabel': hoverlabel
+            }
+            for series_data, name, color, customdata in series
+        ]
         
         # Add filtering context to title
         filter_parts = []
@@ -761,43 +944,30 @@ def get_monthly_activity(metric: str = "count", industry: str = "all", theme: st
         subtitle = f"Real Form D data - {base_subtitle}{filter_text}"
         
         # Apply base layout configuration
-        layout_config = base_layout(theme=theme)
-        layout_config.update({
+        layout_config = {
+            **BASE_LAYOUTS[resolve_theme(theme)],
             'title': build_chart_title("Monthly Filing Activity", subtitle, theme_colors),
-            'xaxis_title': "Month", 
-            'yaxis_title': y_title,
             'height': 500, 
             'hovermode': 'x',
             'margin': {'l': 80, 'r': 50, 't': 80, 'b': 80},
-            'xaxis': {
-                'title': {'font': {'color': theme_colors["text"]}},
-                'tickfont': {'color': theme_colors["text"]},
-                'gridcolor': theme_colors["grid"]
-            },
-            'yaxis': {
-                'range': [0, max(max(equity_data), max(debt_data), max(fund_data)) * 1.1],
-                'title': {'font': {'color': theme_colors["text"]}},
-                'tickfont': {'color': theme_colors["text"]},
-                'gridcolor': theme_colors["grid"]
-            },
+            'xaxis': get_axis_layout(theme, "Month"),
+            'yaxis': get_axis_layout(theme, y_title, range=[0, y_max]),
             'legend': {
                 'font': {'color': theme_colors["text"], 'size': 12}
             },
             'dragmode': False
-        })
+        }
 
-        fig.update_layout(layout_config)
-        
-        # Convert figure to JSON and apply config
-        return figure_to_json(fig)
+        # Assemble the figure JSON and apply config
+        return build_figure(traces, layout_config)
         
     except Exception as e:
-        print(f"Error in monthly_activity: {e}")
+        logger.error("Error in monthly_activity: %s", e)
         return {"error": str(e)}
 
 @app.get("/top_fundraisers")
 @cache_response
-def get_top_fundraisers(year: str = None, industry: str = None, metric: str = "offering_amount", theme: str = "dark", raw: bool = False):
+async def get_top_fundraisers(year: str = None, industry: str = None, metric: str = "offering_amount", theme: str = "dark", raw: bool = False, nocache: bool = False):
     """Get top 20 fundraisers chart with filtering options"""
     try:
         # Build query parameters
@@ -806,7 +976,7 @@ def get_top_fundraisers(year: str = None, industry: str = None, metric: str = "o
         if query_string:
             endpoint += f"&{query_string}"
         
-        data = fetch_backend_data(endpoint)
+        data = await fetch_backend_data(endpoint, use_cache=not nocache)
         
         if not data or not data.get("top_fundraisers"):
             return {"error": "No data available from backend"}
@@ -823,119 +993,115 @@ def get_top_fundraisers(year: str = None, industry: str = None, metric: str = "o
         if raw:
             return fundraisers
         
-        # Sort data in ascending order for proper display (smallest at bottom, largest at top)
-        fundraisers = sorted(fundraisers, key=lambda x: x.get("amount", 0), reverse=False)
+        # Flip to ascending order for proper display (smallest at bottom, largest at top)
+        fundraisers.reverse()
         
         # Get theme colors
-        theme_colors = get_theme_colors(theme)
+        theme_colors = THEME_COLORS[resolve_theme(theme)]
+        
+        # Extract every bar column in a single pass over the fundraisers
+        amounts, company_names, security_types = [], [], []
+        for item in fundraisers:
+            amounts.append(item["amount"])
+            company_names.append(truncate_label(item["company_name"], 40))
+            security_types.append(item.get("security_type", "Unknown"))
         
         # Format amounts for display
-        amounts = [item.get("amount", 0) for item in fundraisers]
+        x_max = max(amounts) * 1.1
         formatted_amounts = format_text_values(amounts, metric)
         
-        fig = go.Figure(data=[go.Bar(
-            x=[item["amount"] for item in fundraisers],
-            y=[item["company_name"][:40] + "..." if len(item["company_name"]) > 40 else item["company_name"] for item in fundraisers],
-            orientation='h',
-            marker_color=[get_security_type_color(item.get("security_type")) for item in fundraisers],
-            text=formatted_amounts,
-            textposition='outside',
-            textfont=dict(color=theme_colors["text"], size=10),
-            hovertemplate='<b>%{y}</b><br>Amount: %{text}<br>Type: %{customdata}<extra></extra>',
-            customdata=[item.get("security_type", "Unknown") for item in fundraisers]
-        )])
+        traces = [{
+            'type': 'bar',
+            'x': amounts,
+            'y': company_names,
+            'orientation': 'h',
+            'marker': {'color': [get_security_type_color(security_type) for security_type in security_types]},
+            'text': formatted_amounts,
+            'textposition': 'outside',
+            'textfont': {'color': theme_colors["text"], 'size': 10},
+            'hovertemplate': '<b>%{y}</b><br>Amount: %{text}<br>Type: %{customdata}<extra></extra>',
+            'customdata': security_types
+        }]
         
         # Add filtering context to title
         filter_text = build_filter_context(year=year, metric=metric, industry=industry)
         subtitle = f"Real Form D data - largest offering amounts{filter_text}"
         
         # Apply base layout configuration
-        layout_config = base_layout(theme=theme)
-        layout_config.update({
+        layout_config = {
+            **BASE_LAYOUTS[resolve_theme(theme)],
             'title': build_chart_title("Top 20 Fundraisers", subtitle, theme_colors),
-            'xaxis_title': get_y_axis_title(metric),
             'height': 600,
             'margin': {'l': 200, 'r': 50, 't': 80, 'b': 80},
-            'xaxis': {
-                'range': [0, max([item["amount"] for item in fundraisers]) * 1.1],
-                'title': {'font': {'color': theme_colors["text"]}},
-                'tickfont': {'color': theme_colors["text"]},
-                'gridcolor': theme_colors["grid"]
-            },
-            'yaxis': {
-                'title': {'font': {'color': theme_colors["text"]}},
-                'tickfont': {'color': theme_colors["text"]},
-                'gridcolor': theme_colors["grid"]
-            },
+            'xaxis': get_axis_layout(theme, get_y_axis_title(metric), range=[0, x_max]),
+            'yaxis': AXIS_STYLES[resolve_theme(theme)],
             'dragmode': False
-        })
+        }
 
-        fig.update_layout(layout_config)
-        
-        # Convert figure to JSON and apply config
-        return figure_to_json(fig)
+        # Assemble the figure JSON and apply config
+        return build_figure(traces, layout_config)
         
     except Exception as e:
-        print(f"Error in top_fundraisers: {e}")
+        logger.error("Error in top_fundraisers: %s", e)
         return {"error": str(e)}
 
 @app.get("/location_distribution")
 @cache_response
-def get_location_distribution(year: str = None, metric: str = "count", theme: str = "dark", raw: bool = False):
+async def get_location_distribution(year: str = None, metric: str = "count", theme: str = "dark", raw: bool = False, nocache: bool = False):
     """Get geographic distribution of filings with filtering options"""
     try:
-        print(f"🔍 Fetching location distribution data... (year: {year}, metric: {metric})")
+        logger.debug("🔍 Fetching location distribution data... (year: %s, metric: %s)", year, metric)
         
         # Build query parameters - match the working HTML approach
         query_string = build_query_params(year=year, metric=metric)
         endpoint = f"charts/location-distribution?{query_string}"
         
-        print(f"📡 Location distribution endpoint: {endpoint}")
+        logger.debug("📡 Location distribution endpoint: %s", endpoint)
         
-        # Add cache-busting for year filtering to ensure fresh data
-        if year and year != "all":
-            import time
-            cache_buster = f"&_t={int(time.time())}"
-            endpoint += cache_buster
-            print(f"🔄 Added cache buster for year filtering: {endpoint}")
-        
-        # Fetch data from backend
-        data = fetch_backend_data(endpoint)
-        print(f"📊 Location distribution response: {data is not None} - has distribution: {data.get('distribution') is not None if data else 'No data'}")
-        print(f"📊 Year parameter sent: {year}, Expected filtering: {year != 'all'}")
-        
-        # Log data size for debugging
-        if data and data.get("distribution"):
-            print(f"📊 Received {len(data['distribution'])} locations from backend")
-            # Log first few entries to see if data changes with year filter
-            if len(data['distribution']) > 0:
-                print(f"📊 Sample data: {data['distribution'][:3]}")
+        # Fetch data from backend (year is part of the endpoint, so each year is cached separately)
+        # Pass nocache=1 to bypass the caches and pull fresh data
+        data = await fetch_backend_data(endpoint, use_cache=not nocache)
+        
+        # Log data size for debugging (the sample and total are only computed when DEBUG is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Year parameter sent: %s, Expected filtering: %s", year, year != "all")
+            if data and data.get("distribution"):
+                logger.debug("📊 Received %d locations from backend", len(data["distribution"]))
+                # Log first few entries to see if data changes with year filter
+                logger.debug("📊 Sample data: %s", data["distribution"][:3])
                 # Calculate total to see if it changes with year filtering
-                total_filings = sum(item.get("value", 0) for item in data['distribution'])
-                print(f"📊 Total filings across all states: {total_filings:,}")
-        else:
-            print(f"📊 No distribution data received from backend")
+                total_filings = sum(item.get("value", 0) for item in data["distribution"])
+                logger.debug("📊 Total filings across all states: %s", f"{total_filings:,}")
+            else:
+                logger.debug("📊 No distribution data received from backend")
         
         if not data or not data.get("distribution"):
             return {"error": "No data available from backend"}
         
-        distribution = data["distribution"][:25]
-        
-        # OPTIONAL - If raw is True, return the data as a list of dictionaries
+        # OPTIONAL - If raw is True, return every location as a list of dictionaries
         if raw:
-            return distribution
+            return data["distribution"]
+        
+        # The map shows the top 25 locations
+        distribution = data["distribution"][:25]
         
-        # Build hover texts based on metric type
-        values = [item['value'] for item in distribution]
+        # Hover text is assembled client-side from the location and value; only amounts need
+        # server-side formatting to keep the $1.2M/$3.4B suffixes
+        # Extract the location and value columns in a single pass over the distribution
+        locations, values = [], []
+        for item in distribution:
+            locations.append(item['name'])
+            values.append(item['value'])
         if is_amount_metric(metric):
             formatted_values = format_text_values(values, metric)
-            hover_texts = [f"{item['name']}: {formatted_values[i]}" for i, item in enumerate(distribution)]
+            hover_template = '<b>%{location}: %{customdata}</b><extra></extra>'
         else:
-            hover_texts = [f"{item['name']}: {item['value']:,} filings" for item in distribution]
+            formatted_values = None
+            hover_template = '<b>%{location}: %{z:,} filings</b><extra></extra>'
         colorbar_title_text = get_y_axis_title(metric)
 
         # Get theme colors
-        theme_colors = get_theme_colors(theme)
+        theme_colors = THEME_COLORS[resolve_theme(theme)]
         
         # Set map colors based on theme
         if theme == "light":
@@ -964,26 +1130,27 @@ def get_location_distribution(year: str = None, metric: str = "count", theme: st
             [1.0, '#2171b5']        # Dark blue for highest values
         ]
         
-        fig = go.Figure(data=go.Choropleth(
-            locations=[item["name"] for item in distribution],
-            z=[item["value"] for item in distribution],
-            locationmode='USA-states',
-            colorscale=custom_colorscale,
-            text=hover_texts,
-            hovertemplate='<b>%{text}</b><extra></extra>',
-            colorbar=dict(
-                title=dict(text=colorbar_title_text, font=dict(color=theme_colors["text"])),
-                tickfont=dict(color=theme_colors["text"])
-            ),
-            zmin=0,  # Minimum value is 0 - states without data will use land_color
-            showscale=True
-        ))
+        traces = [{
+            'type': 'choropleth',
+            'locations': locations,
+            'z': values,
+            'locationmode': 'USA-states',
+            'colorscale': custom_colorscale,
+            'customdata': formatted_values,
+            'hovertemplate': hover_template,
+            'colorbar': {
+                'title': {'text': colorbar_title_text, 'font': {'color': theme_colors["text"]}},
+                'tickfont': {'color': theme_colors["text"]}
+            },
+            'zmin': 0,  # Minimum value is 0 - states without data will use land_color
+            'showscale': True
+        }]
         
         # Add filtering context to title
         filter_text = build_filter_context(year=year, metric=metric)
         
         # Calculate total for display in title
-        total_value = sum(item.get("value", 0) for item in distribution)
+        total_value = sum(values)
         total_value_formatted = format_currency_short(total_value) if is_amount_metric(metric) else f"{total_value:,}"
         
         # Create more informative subtitle
@@ -1001,8 +1168,8 @@ def get_location_distribution(year: str = None, metric: str = "count", theme: st
             subtitle += f" {filter_text}"
         
         # Apply base layout configuration
-        layout_config = base_layout(theme=theme)
-        layout_config.update({
+        layout_config = {
+            **BASE_LAYOUTS[resolve_theme(theme)],
             'title': build_chart_title("Geographic Distribution", subtitle, theme_colors),
             'geo': {
                 'scope': 'usa',
@@ -1023,169 +1190,126 @@ def get_location_distribution(year: str = None, metric: str = "count", theme: st
             'height': 600,
             'margin': {'l': 50, 'r': 50, 't': 80, 'b': 50},
             'dragmode': False
-        })
+        }
 
-        fig.update_layout(layout_config)
-        
-        # Convert figure to JSON and apply config
-        return figure_to_json(fig)
+        # Assemble the figure JSON and apply config
+        return build_figure(traces, layout_config)
         
     except Exception as e:
-        print(f"Error in location_distribution: {e}")
+        logger.error("Error in location_distribution: %s", e)
         return {"error": str(e)}
 
 @app.get("/yearly_statistics")
 @cache_response
-def get_yearly_statistics(metric: str = "count", industry: str = "all", theme: str = "dark", raw: bool = False):
+async def get_yearly_statistics(metric: str = "count", industry: str = "all", theme: str = "dark", raw: bool = False, nocache: bool = False):
     """Get yearly statistics by aggregating monthly data from existing endpoints"""
     try:
-        print(f"🔍 Generating yearly statistics from monthly data... (metric: {metric}, industry: {industry})")
-        
-        # Get monthly data from existing endpoints
-        if industry and industry != "all":
-            # Use industry-specific timeseries endpoint
-            endpoint = f"charts/industry-timeseries?metric={metric}&industry={industry}"
-        else:
-            # Use amount-raised-timeseries for all industries
-            if metric == "offering_amount":
-                endpoint = "charts/amount-raised-timeseries?metric=offering_amount"
-            elif metric == "amount_sold":
-                endpoint = "charts/amount-raised-timeseries?metric=amount_sold"
-            else:
-                endpoint = "charts"
+        logger.debug("🔍 Generating yearly statistics from monthly data... (metric: %s, industry: %s)", metric, industry)
         
-        data = fetch_backend_data(endpoint)
+        # Get monthly data from the same endpoint as the monthly activity chart
+        endpoint = get_timeseries_endpoint(metric, industry)
+        data = await fetch_backend_data(endpoint, use_cache=not nocache)
         
         if not data:
             return {"error": "No data available from backend"}
         else:
-            # Aggregate monthly data into yearly totals
-            yearly_totals = {}
-            
+            # Pick the per-month value accessor once, based on response format and metric
             if industry and industry != "all":
                 # Industry-specific data format
                 time_series = data.get("timeseries", [])
-                for item in time_series:
-                    year = item["date"][:4]  # Extract year from YYYY-MM format
-                    if metric in ["offering_amount", "amount_sold"]:
-                        value = item.get("total_amount", 0)
-                    else:
-                        value = item.get("filings", 0)
-                    
-                    if year not in yearly_totals:
-                        yearly_totals[year] = 0
-                    yearly_totals[year] += value
+                total_key = "total_amount" if is_amount_metric(metric) else "filings"
+                extract_value = lambda item: item.get(total_key, 0)
             else:
-                # All industries data format
+                # All industries data format - sum the three security types
                 time_series = data.get("time_series", [])
-                for item in time_series:
-                    year = item["date"][:4]  # Extract year from YYYY-MM format
-                    
-                    if metric == "offering_amount":
-                        value = (item.get("equity_amount", 0) or 0) + (item.get("debt_amount", 0) or 0) + (item.get("fund_amount", 0) or 0)
-                    elif metric == "amount_sold":
-                        value = (item.get("equity_amount", 0) or 0) + (item.get("debt_amount", 0) or 0) + (item.get("fund_amount", 0) or 0)
-                    else:
-                        value = (item.get("equity_filings", 0) or 0) + (item.get("debt_filings", 0) or 0) + (item.get("fund_filings", 0) or 0)
-                    
-                    if year not in yearly_totals:
-                        yearly_totals[year] = 0
-                    yearly_totals[year] += value
+                equity_key, debt_key, fund_key = get_security_type_keys(metric)
+                extract_value = lambda item: (item.get(equity_key, 0) or 0) + (item.get(debt_key, 0) or 0) + (item.get(fund_key, 0) or 0)
+            
+            # Aggregate monthly data into yearly totals
+            yearly_totals = defaultdict(int)
+            for item in time_series:
+                yearly_totals[item["date"][:4]] += extract_value(item)  # Extract year from YYYY-MM format
             
-            # Convert to list format and filter to start from 2009
-            yearly_data = [{"year": year, "value": total} for year, total in sorted(yearly_totals.items()) if int(year) >= 2009]
+            # Keep (year, total) pairs from 2009 onwards, in year order (YYYY strings compare like numbers)
+            yearly_items = [(year, total) for year, total in sorted(yearly_totals.items()) if year >= "2009"]
         
         # OPTIONAL - If raw is True, return the data as a list of dictionaries
         if raw:
-            return yearly_data
-        
-        # Sort by year
-        yearly_data = sorted(yearly_data, key=lambda x: x.get("year", "0"))
+            return [{"year": year, "value": total} for year, total in yearly_items]
         
         # Get theme colors
-        theme_colors = get_theme_colors(theme)
+        theme_colors = THEME_COLORS[resolve_theme(theme)]
         
         # Prepare data for chart
-        years = [item["year"] for item in yearly_data]
-        values = [float(item["value"]) for item in yearly_data]
+        years = [year for year, _ in yearly_items]
+        values = [float(total) for _, total in yearly_items]
         
-        # Format values for display
-        text_values = format_text_values(values, metric)
+        # Format amounts for display; counts are formatted client-side by the text template
+        text_values = format_text_values(values, metric) if is_amount_metric(metric) else None
         y_title = get_y_axis_title(metric)
         hover_template = get_hover_template(metric, "bar")
         
         # Create bar chart
-        fig = go.Figure(data=[go.Bar(
-            x=years,
-            y=values,
-            marker_color=theme_colors["main_line"],
-            text=text_values,
-            textposition='outside',
-            textfont=dict(color=theme_colors["text"], size=12),
-            hovertemplate=hover_template,
-            customdata=text_values
-        )])
+        traces = [{
+            'type': 'bar',
+            'x': years,
+            'y': values,
+            'marker': {'color': theme_colors["main_line"]},
+            'text': text_values,
+            'texttemplate': None if text_values else '%{y:,.0f}',
+            'textposition': 'outside',
+            'textfont': {'color': theme_colors["text"], 'size': 12},
+            'hovertemplate': hover_template
+        }]
         
         # Add filtering context to title
         filter_text = build_filter_context(metric=metric, industry=industry)
         subtitle = f"Annual totals by year{filter_text}"
         
         # Apply base layout configuration
-        layout_config = base_layout(theme=theme)
-        layout_config.update({
+        layout_config = {
+            **BASE_LAYOUTS[resolve_theme(theme)],
             'title': build_chart_title("Yearly Statistics", subtitle, theme_colors),
-            'xaxis_title': "Year",
-            'yaxis_title': y_title,
             'height': 500,
             'margin': {'l': 80, 'r': 50, 't': 80, 'b': 80},
-            'xaxis': {
-                'title': {'font': {'color': theme_colors["text"]}},
-                'tickfont': {'color': theme_colors["text"]},
-                'gridcolor': theme_colors["grid"]
-            },
-            'yaxis': {
-                'title': {'font': {'color': theme_colors["text"]}},
-                'tickfont': {'color': theme_colors["text"]},
-                'gridcolor': theme_colors["grid"]
-            },
+            'xaxis': get_axis_layout(theme, "Year"),
+            'yaxis': get_axis_layout(theme, y_title),
             'dragmode': False
-        })
+        }
 
-        fig.update_layout(layout_config)
-        
-        # Convert figure to JSON and apply config
-        return figure_to_json(fig)
+        # Assemble the figure JSON and apply config
+        return build_figure(traces, layout_config)
         
     except Exception as e:
-        print(f"Error in yearly_statistics: {e}")
+        logger.error("Error in yearly_statistics: %s", e)
         return {"error": str(e)}
 
 @app.get("/api/available_years")
 @cache_response
-def get_available_years():
+async def get_available_years():
     """Get available years from the backend for dynamic filtering"""
     try:
         # Fetch available years from backend
-        data = fetch_backend_data("charts/security-type-distribution?metric=count")
+        data = await fetch_backend_data("charts/security-type-distribution?metric=count")
         
         if data and data.get("available_years"):
-            years = data["available_years"]
-            # Filter years to start from 2009
-            years = [year for year in years if int(year) >= 2009]
+            # Parse each year once and filter years to start from 2009, newest first
+            years = sorted((year for year in map(int, data["available_years"]) if year >= 2009), reverse=True)
             # Format for dropdown options
             options = [{"label": "All Years", "value": "all"}]
-            for year in sorted(years, reverse=True):
-                options.append({"label": str(year), "value": str(year)})
+            for year in map(str, years):
+                options.append({"label": year, "value": year})
             return {"years": options}
         else:
             return {"error": "No data available from backend"}
     except Exception as e:
-        print(f"Error getting available years: {e}")
+        logger.error("Error getting available years: %s", e)
         return {"error": str(e)}
 
 @app.get("/cache_status")
-def get_cache_status():
+async def get_cache_status():
     """Debug endpoint to check cache status"""
+    # async so the caches are read on the event loop thread that mutates them
     current_time = time.time()
     cache_info = []
     
@@ -1193,40 +1317,43 @@ def get_cache_status():
         age = current_time - timestamp
         is_expired = age >= CACHE_DURATION
         cache_info.append({
-            "key": key[:16] + "..." if len(key) > 16 else key,
+            "key": truncate_label(key, 16),
             "age_seconds": round(age, 1),
             "expires_in": round(CACHE_DURATION - age, 1) if not is_expired else 0,
             "is_expired": is_expired,
-            "data_type": type(data).__name__
+            "data_type": type(data).__name__,
+            "size_bytes": len(data)
         })
     
     return {
         "cache_duration": CACHE_DURATION,
         "total_cached_items": len(cache_store),
+        "backend_cache_duration": BACKEND_CACHE_DURATION,
+        "backend_cache_durations": BACKEND_CACHE_DURATIONS,
+        "backend_cached_items": len(backend_cache),
         "items": cache_info
     }
 
 if __name__ == "__main__":
-    print("🚀 Starting Form D Analytics Hub")
-    print(f"📡 Backend: {BACKEND_URL}")
-    print("📊 Widgets: Latest Filings, Security Types, Industries, Time Series")
-    print("📈 Yearly Statistics: Annual bar charts for filings and amounts")
-    print("🗺️  Geographic: US State Distribution")
-    print("💰 Top Fundraisers: Largest Offering Amounts")
-    print("📈 Three Tabs: Overview, Market Trends, Geographic Analysis")
-    print("🔗 Real data from Railway backend")
-    print("🔧 Widget types: markdown, table, chart")
-    print("📝 Form D Intro: Professional markdown content without emojis")
-    print("📊 Security Types: Returns Plotly chart JSON for OpenBB chart widget")
-    print("🎨 ALL TEXT WHITE: Charts now have white text throughout")
-    print("🔒 NON-RESIZABLE: Drag and zoom disabled on all charts")
-    print("=" * 60)
-    
     port = int(os.getenv("PORT", 8000))
-    print(f"🌐 Server starting on port {port}")
-    print(f"🔗 Access at: http://localhost:{port}")
-    print(f"📊 Widgets: http://localhost:{port}/widgets.json")
-    print(f"📱 Apps: http://localhost:{port}/apps.json")
-    print("=" * 60)
+    # Startup banner goes through the logger so it follows FORM_D_LOG_LEVEL
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("🚀 Starting Form D Analytics Hub")
+        logger.info("📡 Backend: %s", BACKEND_URL)
+        logger.info("📊 Widgets: Latest Filings, Security Types, Industries, Time Series")
+        logger.info("📈 Yearly Statistics: Annual bar charts for filings and amounts")
+        logger.info("🗺️  Geographic: US State Distribution")
+        logger.info("💰 Top Fundraisers: Largest Offering Amounts")
+        logger.info("📈 Three Tabs: Overview, Market Trends, Geographic Analysis")
+        logger.info("🔗 Real data from Railway backend")
+        logger.info("🔧 Widget types: markdown, table, chart")
+        logger.info("📝 Form D Intro: Professional markdown content without emojis")
+        logger.info("📊 Security Types: Returns Plotly chart JSON for OpenBB chart widget")
+        logger.info("🎨 ALL TEXT WHITE: Charts now have white text throughout")
+        logger.info("🔒 NON-RESIZABLE: Drag and zoom disabled on all charts")
+        logger.info("🌐 Server starting on port %d", port)
+        logger.info("🔗 Access at: http://localhost:%d", port)
+        logger.info("📊 Widgets: http://localhost:%d/widgets.json", port)
+        logger.info("📱 Apps: http://localhost:%d/apps.json", port)
     
     uvicorn.run(app, host="0.0.0.0", port=port)